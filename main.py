@@ -1,61 +1,155 @@
 # File: main.py
 import asyncio
-import json
-import toml
+import atexit
+import logging
+import logging.handlers
+import queue
+import orjson
+import tomllib
+import collections
+import mmap
+import pickle
+import random
 import struct
-import websockets
-import requests
 import os
 import sys
-import time
+from itertools import chain
 from pathlib import Path
+from urllib.parse import urlencode
 import signal
+import socket
 import aiohttp
 from aiohttp import web
 import colorama
 from colorama import Fore, Style
 
-# Initialize colorama for cross-platform colored terminal output
-colorama.init()
+
+class ColorFormatter(logging.Formatter):
+    """Colorize records by level, but only when writing to a terminal"""
+
+    LEVEL_COLORS = {
+        logging.DEBUG: Fore.LIGHTBLACK_EX,
+        logging.WARNING: Fore.LIGHTYELLOW_EX,
+        logging.ERROR: Fore.LIGHTRED_EX,
+        logging.CRITICAL: Fore.LIGHTRED_EX,
+    }
+
+    def __init__(self, use_color):
+        super().__init__("%(message)s")
+        # Precomputed "<color>%s<reset>" templates, empty when not on a terminal
+        self._templates = (
+            {
+                level: f"{color}%s{Style.RESET_ALL}"
+                for level, color in self.LEVEL_COLORS.items()
+            }
+            if use_color
+            else {}
+        )
+
+    def format(self, record):
+        message = super().format(record) if record.exc_info else record.getMessage()
+        template = self._templates.get(record.levelno)
+        return template % message if template else message
+
+
+# Initialize colorama for cross-platform colored terminal output (TTY only)
+if sys.stdout.isatty():
+    colorama.init()
+
+logger = logging.getLogger("comfy_runner")
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(ColorFormatter(use_color=sys.stdout.isatty()))
+
+# The event loop only enqueues records; a listener thread does the stdout writes
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes queued records on every exit path
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
+logger.propagate = False
 
 
 # Load configuration
 def load_config(config_path="config.toml"):
-    """Load configuration from TOML file"""
+    """Load configuration from TOML file (cached by mtime + size)"""
     try:
         config_file = Path(config_path)
         if config_file.exists():
-            print(
-                f"\n{Fore.BLUE}Loading configuration from:{Style.RESET_ALL} {config_file}"
-            )
-            return toml.load(config_file)
+            logger.info(f"\nLoading configuration from: {config_file}")
+            stat = config_file.stat()
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+            cache_file = config_file.with_name(config_file.name + ".cache.pkl")
+
+            # Reuse the parsed config if the TOML file hasn't changed
+            try:
+                with open(cache_file, "rb") as f:
+                    cached_key, cached_config = pickle.load(f)
+                if cached_key == stat_key:
+                    return cached_config
+            except Exception:
+                pass  # Missing or stale cache, fall through to a fresh parse
+
+            with open(config_file, "rb") as f:
+                config = tomllib.load(f)
+
+            # Write the cache atomically so a crash never leaves a torn file
+            try:
+                tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+                with open(tmp_file, "wb") as f:
+                    pickle.dump((stat_key, config), f)
+                os.replace(tmp_file, cache_file)
+            except OSError:
+                pass  # Caching is best-effort only
+
+            return config
         else:
-            print(f"{Fore.LIGHTRED_EX}Config: {config_file} not found{Style.RESET_ALL}")
+            logger.error(f"Config: {config_file} not found")
             return None
     except Exception as e:
-        print(f"{Fore.LIGHTRED_EX}Error loading config:{Style.RESET_ALL} {e}")
+        logger.error(f"Error loading config: {e}")
         return None
 
 
 # Load configuration
 CONFIG = load_config()
 if not CONFIG:
-    print(f"{Fore.LIGHTRED_EX}Exiting...{Style.RESET_ALL}")
+    logger.error("Exiting...")
     sys.exit(1)
 
+# Log level from config (DEBUG shows every relayed event and progress step)
+LOG_LEVEL = str(CONFIG.get("logging", {}).get("level", "INFO")).upper()
+try:
+    logger.setLevel(LOG_LEVEL)
+except ValueError:
+    logger.error(f"Invalid [logging] level: {LOG_LEVEL}, using INFO instead")
+
 # Extract configuration values with defaults
 COMFY_SERVER = CONFIG.get("comfy", {}).get("host", "127.0.0.1")
 COMFY_PORT = CONFIG.get("comfy", {}).get("port", 8188)
 CURR_WORKFLOW = CONFIG.get("comfy", {}).get("workflow", "workflows/workflow_api.json")
 MIDDLEWARE_HTTP_PORT = CONFIG.get("http-server", {}).get("port", 8189)
+MIDDLEWARE_UNIX_SOCKET = CONFIG.get("http-server", {}).get("unix_socket")
 RELAY_WS_PORT = CONFIG.get("server", {}).get("ws_port", 8190)
 
+# ComfyUI endpoint URLs, built once from the config
+COMFY_BASE = f"http://{COMFY_SERVER}:{COMFY_PORT}"
+URL_INTERRUPT = f"{COMFY_BASE}/interrupt"
+URL_STATS = f"{COMFY_BASE}/system_stats"
+URL_PROMPT = f"{COMFY_BASE}/prompt"
+URL_QUEUE = f"{COMFY_BASE}/queue"
+URL_HISTORY_TMPL = f"{COMFY_BASE}/history/{{}}"
+VIEW_BASE = f"{COMFY_BASE}/view"
+WORKFLOW_MMAP_THRESHOLD = 1024 * 1024  # Workflow files above this size are mmap'ed
+
 # Node mappings from config
 NODE_MAPPINGS = CONFIG.get("node_mappings", {})
 SAVE_IMAGE_NODE_ID = NODE_MAPPINGS.get("save_image_node", "9")
+# Both forms, so WS event node IDs can be matched without str() coercion
+SAVE_IMAGE_NODE_IDS = frozenset({str(SAVE_IMAGE_NODE_ID), SAVE_IMAGE_NODE_ID})
 
-# Text input field keys that accept string values
-TEXT_INPUT_KEYS = [
+# Text input field keys that accept string values, in "first match wins" order
+TEXT_INPUT_PRIORITY = (
     "text",
     "value",
     "text_positive",
@@ -67,7 +161,8 @@ TEXT_INPUT_KEYS = [
     "key",
     "url",
     "model",
-]
+)
+TEXT_INPUT_KEYS = frozenset(TEXT_INPUT_PRIORITY)
 
 # Global state variables
 current_prompt_id = None
@@ -76,29 +171,69 @@ session_id = None
 workflow_json = None
 execution_status = "idle"
 connected_clients = set()
+CLIENT_SEND_TIMEOUT = 2.0
+
+# 8-byte little-endian event type header of ComfyUI binary (preview image) messages
+_PREVIEW_HDR = struct.Struct("<Q")
+
+# Serialized /prompt payload for workflow_json, rebuilt only after an update
+_workflow_bytes: bytes | None = None
+_workflow_bytes_key = None
+_workflow_version = 0
+
+# Shared HTTP session for all ComfyUI requests (created at server startup)
+HTTP_SESSION: aiohttp.ClientSession | None = None
+
+# Long-lived ComfyUI WebSocket reader and per-prompt event queues fed by it
+comfy_ws_reader_task: asyncio.Task | None = None
+prompt_queues: dict[str, asyncio.Queue] = {}
+unclaimed_messages = collections.deque(maxlen=256)
+WS_RECONNECT_ATTEMPTS = 5
+WS_RECONNECT_MIN_DELAY = 0.1
+WS_RECONNECT_MAX_DELAY = 5.0
+_reconnect_delay = WS_RECONNECT_MIN_DELAY  # Grows across failures, reset on success
+_resolved_hosts: dict[str, str] = {}  # ComfyUI host name -> IPv4 literal
+ws_down = asyncio.Event()  # Set by the reader when the ComfyUI WebSocket drops
+_ws_connect_lock = asyncio.Lock()
+
+# Pending image results per prompt_id, resolved from the save node's "executed" event
+pending_images: dict[str, asyncio.Future] = {}
 
 # Display configuration
-print(f"\n{Fore.LIGHTBLACK_EX}COMFY_SERVER_HOST:{Style.RESET_ALL} {COMFY_SERVER}")
-print(f"{Fore.LIGHTBLACK_EX}COMFY_SERVER_PORT:{Style.RESET_ALL} {COMFY_PORT}")
-print(f"{Fore.LIGHTBLACK_EX}CURR_WORKFLOW:{Style.RESET_ALL} {CURR_WORKFLOW}")
-print(
-    f"{Fore.LIGHTBLACK_EX}MIDDLEWARE_HTTP_PORT:{Style.RESET_ALL} {MIDDLEWARE_HTTP_PORT}"
-)
-print(f"{Fore.LIGHTBLACK_EX}MIDDLEWARE_WS_PORT:{Style.RESET_ALL} {RELAY_WS_PORT}")
-print(f"{Fore.LIGHTBLACK_EX}SAVE_IMAGE_NODE_ID:{Style.RESET_ALL} {SAVE_IMAGE_NODE_ID}")
-
-time.sleep(2)
+logger.info(f"\nCOMFY_SERVER_HOST: {COMFY_SERVER}")
+logger.info(f"COMFY_SERVER_PORT: {COMFY_PORT}")
+logger.info(f"CURR_WORKFLOW: {CURR_WORKFLOW}")
+logger.info(f"MIDDLEWARE_HTTP_PORT: {MIDDLEWARE_HTTP_PORT}")
+logger.info(f"MIDDLEWARE_WS_PORT: {RELAY_WS_PORT}")
+logger.info(f"SAVE_IMAGE_NODE_ID: {SAVE_IMAGE_NODE_ID}")
 
 
 def signal_handler(sig, frame):
     """Handle Ctrl+C and other termination signals"""
-    print(f"{Fore.LIGHTYELLOW_EX}Received termination signal.{Style.RESET_ALL}")
-    print(f"{Fore.LIGHTBLACK_EX}Cancelling workflow and exiting...{Style.RESET_ALL}")
+    logger.warning("Received termination signal.")
+    logger.info("Cancelling workflow and exiting...")
 
     if current_prompt_id:
-        cancel_workflow(current_prompt_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
 
-    print(f"{Fore.LIGHTBLUE_EX}Exiting gracefully.{Style.RESET_ALL}")
+        if loop and loop.is_running():
+            # We're inside the event loop: cancel on the loop, then exit from there
+            asyncio.run_coroutine_threadsafe(_cancel_and_exit(current_prompt_id), loop)
+            return
+
+        asyncio.run(cancel_workflow(current_prompt_id))
+
+    logger.info("Exiting gracefully.")
+    sys.exit(0)
+
+
+async def _cancel_and_exit(prompt_id):
+    """Cancel the running workflow and exit (scheduled by signal_handler)"""
+    await cancel_workflow(prompt_id)
+    logger.info("Exiting gracefully.")
     sys.exit(0)
 
 
@@ -111,24 +246,54 @@ signal.signal(signal.SIGTERM, signal_handler)
 def create_json_response(data, status=200):
     """Helper function to create consistent JSON responses"""
     return web.Response(
-        text=json.dumps(data), status=status, content_type="application/json"
+        body=orjson.dumps(data), status=status, content_type="application/json"
     )
 
 
+def create_static_json_response(body, status=200):
+    """Wrap a pre-encoded JSON body (aiohttp Responses can't be reused across requests)"""
+    return web.Response(body=body, status=status, content_type="application/json")
+
+
+def _ok_status_bytes(fmt, *args):
+    """Build a 200 JSON response by formatting bytes args straight into the body"""
+    return create_static_json_response(fmt % args)
+
+
+def _json_escape(value):
+    """Encode a value as the inside of a JSON string literal (quotes stripped)"""
+    return orjson.dumps(str(value))[1:-1]
+
+
+# Pre-encoded bodies for the common static rejections
+_BODY_TEXT_RUNNING = orjson.dumps(
+    {"STATUS": "Cannot update text while workflow is running"}
+)
+_BODY_IMAGE_RUNNING = orjson.dumps(
+    {"STATUS": "Cannot update image while workflow is running"}
+)
+_BODY_NO_WORKFLOW = orjson.dumps({"STATUS": "No workflow loaded"})
+_BODY_HEALTH = orjson.dumps({"STATUS": "ComfyUI Workflow Runner is running"})
+
+# /status body, re-encoded only when one of the fields it reports changes
+_status_bytes: bytes | None = None
+_status_bytes_key = None
+
+
 async def validate_json_request(request, required_fields):
     """Validate JSON request and required fields"""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.read())
         missing_fields = [
             field for field in required_fields if field not in data or not data[field]
         ]
         if missing_fields:
             return None, f"Missing required fields: {', '.join(missing_fields)}"
         return data, None
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return None, "Invalid JSON in request body"
     except Exception as e:
-        return None, f"Error parsing request: {str(e)}"
+        return None, f"Error parsing request: {e}"
 
 
 def validate_node_id(node_id_str):
@@ -140,51 +305,90 @@ def validate_node_id(node_id_str):
 
 
 # WebSocket Functions
-async def handle_websocket_client(websocket):
+async def handle_websocket_client(request):
     """Handle new WebSocket client connections (e.g.: Node-RED)"""
-    print(
-        f"{Fore.LIGHTGREEN_EX}New WebSocket client connected from {websocket.remote_address}{Style.RESET_ALL}"
-    )
+    # No per-message deflate: relayed image frames are already compressed
+    websocket = web.WebSocketResponse(heartbeat=30, compress=False)
+    await websocket.prepare(request)
+
+    logger.info(f"New WebSocket client connected from {request.remote}")
 
     connected_clients.add(websocket)
 
     try:
         async for message in websocket:
-            print(f"Received message from client: {message}")
-    except websockets.exceptions.ConnectionClosed:
-        print(f"{Fore.LIGHTYELLOW_EX}WebSocket client disconnected{Style.RESET_ALL}")
+            if message.type == aiohttp.WSMsgType.ERROR:
+                logger.error(f"WebSocket client error: {websocket.exception()}")
+                break
+            logger.debug("Received message from client: %s", message.data)
+        else:
+            logger.warning("WebSocket client disconnected")
     except Exception as e:
-        print(f"{Fore.LIGHTRED_EX}WebSocket client error: {e}{Style.RESET_ALL}")
+        logger.error(f"WebSocket client error: {e}")
     finally:
         connected_clients.discard(websocket)
-        print(
-            f"{Fore.LIGHTBLACK_EX}Client removed.{Style.RESET_ALL} Active clients: {len(connected_clients)}"
-        )
+        logger.info(f"Client removed. Active clients: {len(connected_clients)}")
+
+    return websocket
 
 
 async def start_websocket_server():
     """Start WebSocket server for Node-RED clients"""
-    print(
-        f"{Fore.LIGHTYELLOW_EX}Starting WebSocket server on:{Fore.LIGHTBLACK_EX} ws://{COMFY_SERVER}:{RELAY_WS_PORT}{Style.RESET_ALL}"
-    )
+    app = web.Application()
+    app.router.add_get("/", handle_websocket_client)
 
-    server = await websockets.serve(
-        handle_websocket_client,
-        COMFY_SERVER,
-        RELAY_WS_PORT,
-        ping_timeout=60,
-        ping_interval=30,
-    )
+    runner = web.AppRunner(app, access_log=None, handle_signals=False)
+    await runner.setup()
+    site = web.TCPSite(runner, COMFY_SERVER, RELAY_WS_PORT)
+
+    logger.info(f"Starting WebSocket server on: ws://{COMFY_SERVER}:{RELAY_WS_PORT}")
+    await site.start()
+
+    logger.info(f"WebSocket server started: ws://{COMFY_SERVER}:{RELAY_WS_PORT}")
+    return runner
 
-    print(
-        f"{Fore.LIGHTGREEN_EX}WebSocket server started:{Fore.LIGHTBLACK_EX} ws://{COMFY_SERVER}:{RELAY_WS_PORT}{Style.RESET_ALL}"
+
+def comfy_websocket_is_open():
+    """Check whether the persistent ComfyUI WebSocket is usable"""
+    # An open socket is useless once its reader has stopped
+    return (
+        ws_connection is not None
+        and not ws_connection.closed
+        and comfy_ws_reader_task is not None
+        and not comfy_ws_reader_task.done()
     )
-    return server
+
+
+async def resolve_comfy_host(server):
+    """Resolve the ComfyUI host once and reuse the IP literal on reconnects"""
+    if server not in _resolved_hosts:
+        try:
+            _resolved_hosts[server] = await asyncio.to_thread(
+                socket.gethostbyname, server
+            )
+        except OSError as e:
+            # Don't cache failures, the next attempt gets a fresh lookup
+            logger.warning(f"Could not resolve {server}, using it as given: {e}")
+            return server
+    return _resolved_hosts[server]
 
 
 async def connect_comfy_websocket(server, port):
-    """Connect to the ComfyUI WebSocket endpoint"""
-    global ws_connection, session_id
+    """Connect to the ComfyUI WebSocket endpoint and start its reader task"""
+    # The reconnect watcher and /queue may both get here, only one may connect
+    async with _ws_connect_lock:
+        if comfy_websocket_is_open():
+            return ws_connection
+        return await _open_comfy_websocket(server, port)
+
+
+async def _open_comfy_websocket(server, port):
+    """Replace the current ComfyUI WebSocket and reader (caller holds the lock)"""
+    global ws_connection, session_id, comfy_ws_reader_task
+
+    # Retire the previous reader first so closing its socket doesn't trigger a reconnect
+    if comfy_ws_reader_task and comfy_ws_reader_task is not asyncio.current_task():
+        comfy_ws_reader_task.cancel()
 
     if ws_connection:
         try:
@@ -192,126 +396,281 @@ async def connect_comfy_websocket(server, port):
         except Exception:
             pass
 
-    ws_url = f"ws://{server}:{port}/ws"
-    print(
-        f"{Fore.LIGHTYELLOW_EX}Connecting to WebSocket at:{Fore.LIGHTBLACK_EX} {ws_url}...{Style.RESET_ALL}"
-    )
+    # Reuse our session ID so ComfyUI keeps routing in-flight prompt events to us
+    host = await resolve_comfy_host(server)
+    ws_url = f"ws://{host}:{port}/ws"
+    if session_id:
+        ws_url += f"?clientId={session_id}"
+    logger.info(f"Connecting to WebSocket at: {ws_url}...")
 
     try:
-        ws_connection = await websockets.connect(
-            ws_url, ping_timeout=60, ping_interval=30
+        ws_connection = await HTTP_SESSION.ws_connect(
+            ws_url, heartbeat=30, max_msg_size=0
         )
 
         # Receive initial status message to get session ID
-        initial_msg = await ws_connection.recv()
-        initial_data = json.loads(initial_msg)
+        initial_msg = await ws_connection.receive_str()
+        initial_data = orjson.loads(initial_msg)
         session_id = initial_data.get("data", {}).get("sid")
 
         if not session_id:
-            print(
-                f"{Fore.LIGHTRED_EX}Failed to get session ID,{Style.RESET_ALL} using 'default_client' instead"
-            )
+            logger.error("Failed to get session ID, using 'default_client' instead")
             session_id = "default_client"
         else:
-            print(
-                f"{Fore.LIGHTGREEN_EX}Got session ID:{Fore.LIGHTBLACK_EX} {session_id} {Style.RESET_ALL}"
-            )
+            logger.info(f"Got session ID: {session_id}")
 
+        comfy_ws_reader_task = asyncio.create_task(
+            _comfy_websocket_reader(ws_connection)
+        )
         return ws_connection
     except Exception as e:
-        print(
-            f"{Fore.LIGHTRED_EX}Failed to connect to WebSocket:{Fore.LIGHTBLACK_EX} \n{e} {Style.RESET_ALL}"
-        )
+        logger.error(f"Failed to connect to WebSocket: \n{e}")
+        # The address may have moved (container restart, DHCP), look it up again
+        _resolved_hosts.pop(server, None)
         return None
 
 
-async def broadcast_to_clients(message, is_binary=False):
+async def reconnect_comfy_websocket():
+    """Reconnect to ComfyUI with capped exponential backoff"""
+    global _reconnect_delay
+    for attempt in range(WS_RECONNECT_ATTEMPTS):
+        if comfy_websocket_is_open() or await connect_comfy_websocket(
+            COMFY_SERVER, COMFY_PORT
+        ):
+            _reconnect_delay = WS_RECONNECT_MIN_DELAY
+            return True
+        logger.warning(
+            f"Reconnect attempt {attempt + 1}/{WS_RECONNECT_ATTEMPTS} failed, "
+            f"retrying in {_reconnect_delay}s"
+        )
+        await asyncio.sleep(_reconnect_delay)
+        # Keep growing across watcher passes so a down ComfyUI isn't hammered
+        _reconnect_delay = min(_reconnect_delay * 2, WS_RECONNECT_MAX_DELAY)
+    return False
+
+
+async def close_comfy_websocket():
+    """Stop the reader task and close the ComfyUI WebSocket"""
+    global ws_connection
+
+    if comfy_ws_reader_task:
+        comfy_ws_reader_task.cancel()
+    if ws_connection:
+        try:
+            await ws_connection.close()
+        except Exception:
+            pass
+        ws_connection = None
+
+
+async def _comfy_websocket_reader(ws):
+    """Relay ComfyUI events to clients and route them to per-prompt queues"""
+    try:
+        async for ws_message in ws:
+            # Binary messages are preview images, relayed as-is
+            if ws_message.type == aiohttp.WSMsgType.BINARY:
+                await handle_preview_image(ws_message.data)
+                continue
+            if ws_message.type == aiohttp.WSMsgType.ERROR:
+                logger.error(f"Error receiving message: {ws.exception()}")
+                break
+
+            # A malformed frame (e.g. from a custom node) is skipped, not fatal
+            try:
+                await _route_comfy_message(ws_message.data)
+            except Exception as e:
+                logger.error(f"Error handling message: {e}")
+
+        logger.error(f"WebSocket connection closed: {ws.close_code}")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Error receiving message: {e}")
+
+    # Nothing reads this socket anymore, so make sure it reports as closed
+    await ws.close()
+
+    # Signal the reconnect watcher, unless a newer connection already replaced this one
+    if ws is ws_connection:
+        ws_down.set()
+
+
+async def _route_comfy_message(message):
+    """Broadcast one ComfyUI text event and queue it for the prompt it belongs to"""
+    msg_data = orjson.loads(message)
+    if not isinstance(msg_data, dict):
+        logger.warning(f"Ignoring non-object WebSocket message: {message[:80]}")
+        return
+
+    # Broadcast these text events to ws clients
+    await broadcast_to_clients(
+        message, is_binary=False, event_type=msg_data.get("type")
+    )
+
+    # Custom nodes may send any payload, only route events shaped like ComfyUI's
+    data = msg_data.get("data", {})
+    if not isinstance(data, dict):
+        logger.debug(
+            "Not routing '%s' event, data is not an object", msg_data.get("type")
+        )
+        return
+
+    # Events without a prompt_id (e.g. progress on older ComfyUI) go to the running one
+    prompt_id = data.get("prompt_id") or current_prompt_id
+    events = prompt_queues.get(prompt_id)
+    if events is not None:
+        events.put_nowait(msg_data)
+    elif prompt_id:
+        # Event arrived before execute_workflow registered the prompt
+        unclaimed_messages.append((prompt_id, msg_data))
+
+
+def _fail_waiting_prompts():
+    """Wake up anyone waiting on prompt events so they can fail fast"""
+    for events in prompt_queues.values():
+        events.put_nowait(None)
+
+
+async def _ws_reconnect_watcher():
+    """Reconnect to ComfyUI whenever the reader reports the WebSocket dropped"""
+    while True:
+        await ws_down.wait()
+        ws_down.clear()
+
+        logger.warning("WebSocket connection needs refresh. Reconnecting...")
+        if not await reconnect_comfy_websocket():
+            _fail_waiting_prompts()
+            ws_down.set()  # Keep trying on the next pass
+
+
+def _register_prompt_queue(prompt_id):
+    """Create the event queue for a prompt, claiming any events that arrived early"""
+    events = asyncio.Queue()
+    prompt_queues[prompt_id] = events
+
+    early = [item for item in unclaimed_messages if item[0] == prompt_id]
+    for item in early:
+        unclaimed_messages.remove(item)
+        events.put_nowait(item[1])
+    return events
+
+
+def _send_text_frame(client, message):
+    """Send already-encoded UTF-8 bytes to a client as a text frame"""
+    return client.send_frame(message, aiohttp.WSMsgType.TEXT)
+
+
+async def broadcast_to_clients(message, is_binary=False, event_type=None):
     """Broadcast ws message to all connected clients (e.g.: Node-RED)"""
     if not connected_clients:
         return
 
-    clients_copy = connected_clients.copy()
+    # Snapshot as a tuple (no rehashing) since clients may join/leave during the await
+    clients = tuple(connected_clients)
     successful_sends = 0
+    to_remove = []
+
+    # Send to all clients concurrently so one slow client can't stall the rest
+    if is_binary:
+        send = web.WebSocketResponse.send_bytes
+    elif isinstance(message, bytes):
+        # Pre-encoded JSON goes out as a text frame without a decode/encode round trip
+        send = _send_text_frame
+    else:
+        send = web.WebSocketResponse.send_str
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(send(client, message), timeout=CLIENT_SEND_TIMEOUT)
+            for client in clients
+        ),
+        return_exceptions=True,
+    )
 
-    for client in clients_copy:
-        try:
-            await client.send(message)
+    for client, result in zip(clients, results):
+        if result is None:
             successful_sends += 1
-        except websockets.exceptions.ConnectionClosed:
-            connected_clients.discard(client)
-            print(f"{Fore.LIGHTYELLOW_EX}Removed disconnected client{Style.RESET_ALL}")
-        except Exception as e:
-            print(f"{Fore.LIGHTRED_EX}Error sending to client: {e}{Style.RESET_ALL}")
-            connected_clients.discard(client)
+            continue
+
+        to_remove.append(client)
+        if isinstance(result, ConnectionResetError):
+            logger.warning("Removed disconnected client")
+        elif isinstance(result, asyncio.TimeoutError):
+            logger.warning("Removed unresponsive client")
+        else:
+            logger.error(f"Error sending to client: {result}")
+
+    if to_remove:
+        connected_clients.difference_update(to_remove)
+        # Close them too, otherwise the heartbeat keeps a client that gets no events
+        for client in to_remove:
+            asyncio.create_task(client.close())
 
     if successful_sends > 0:
         if is_binary:
-            print(
-                f"{Fore.LIGHTBLACK_EX}Sent binary data ({len(message)} bytes) to {successful_sends} client(s){Style.RESET_ALL}"
+            logger.debug(
+                "Sent binary data (%d bytes) to %d client(s)",
+                len(message),
+                successful_sends,
             )
         else:
-            try:
-                msg_data = json.loads(message)
-                event_type = msg_data.get("type", "unknown")
-                print(
-                    f"{Fore.LIGHTBLUE_EX}Broadcast '{event_type}' event to {successful_sends} clients{Style.RESET_ALL}"
-                )
-            except:
-                print(
-                    f"{Fore.LIGHTBLUE_EX}Broadcast text data to {successful_sends} clients{Style.RESET_ALL}"
-                )
+            logger.debug(
+                "Broadcast '%s' event to %d clients",
+                event_type or "text",
+                successful_sends,
+            )
 
 
 # ComfyUI Helper Functions
-def test_comfyui_connection(server_addr, port_num):
+def create_http_session():
+    """Create the shared keep-alive HTTP session used for ComfyUI requests"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=75)
+    )
+
+
+async def test_comfyui_connection():
     """Test connectivity to ComfyUI server"""
     try:
-        url = f"http://{server_addr}:{port_num}/system_stats"
-        print(
-            f"{Fore.LIGHTYELLOW_EX}Testing connectivity to ComfyUI at{Fore.LIGHTBLACK_EX} {url} {Style.RESET_ALL}"
-        )
-
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            print(f"{Fore.LIGHTGREEN_EX}ComfyUI connection successful{Style.RESET_ALL}")
-            return True
-        else:
-            print(
-                f"{Fore.LIGHTRED_EX}ComfyUI connection failed: {Fore.LIGHTBLACK_EX}{response.status_code}{Style.RESET_ALL}"
-            )
-            return False
+        url = URL_STATS
+        logger.info(f"Testing connectivity to ComfyUI at {url}")
+
+        async with HTTP_SESSION.get(
+            url, timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            if response.status == 200:
+                logger.info("ComfyUI connection successful")
+                return True
+            else:
+                logger.error(f"ComfyUI connection failed: {response.status}")
+                return False
     except Exception as e:
-        print(
-            f"{Fore.LIGHTRED_EX}Error connecting to ComfyUI: \n{Fore.LIGHTBLACK_EX}{e}{Style.RESET_ALL}"
-        )
+        logger.error(f"Error connecting to ComfyUI: \n{e}")
         return False
 
 
 def load_workflow_from_file(workflow_file):
     """Load workflow JSON from file without executing it"""
     if not os.path.exists(workflow_file):
-        print(
-            f"{Fore.LIGHTRED_EX}Error: Workflow file '{workflow_file}' not found.{Style.RESET_ALL}"
-        )
+        logger.error(f"Error: Workflow file '{workflow_file}' not found.")
         return None
 
     try:
-        with open(workflow_file, "r") as f:
-            workflow_data = json.load(f)
+        with open(workflow_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size > WORKFLOW_MMAP_THRESHOLD:
+                # Parse large workflows straight from the page cache, skipping a copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        workflow_data = orjson.loads(view)
+            else:
+                workflow_data = orjson.loads(f.read())
 
-        print(
-            f"{Fore.LIGHTGREEN_EX}Workflow loaded: {Fore.BLACK}{workflow_file}{Style.RESET_ALL}"
-        )
+        logger.info(f"Workflow loaded: {workflow_file}")
         return workflow_data
-    except json.JSONDecodeError:
-        print(
-            f"{Fore.LIGHTRED_EX}Error: The file {workflow_file} contains invalid JSON.{Style.RESET_ALL}"
-        )
+    except orjson.JSONDecodeError:
+        logger.error(f"Error: The file {workflow_file} contains invalid JSON.")
         return None
     except Exception as e:
-        print(
-            f"{Fore.LIGHTRED_EX}Error loading workflow file: \n{Fore.LIGHTBLACK_EX}{e}{Style.RESET_ALL}"
-        )
+        logger.error(f"Error loading workflow file: \n{e}")
         return None
 
 
@@ -320,30 +679,25 @@ def update_text_node_with_text(workflow, node_id, text_value):
     node_id_str = str(node_id)
 
     if node_id_str not in workflow:
-        print(
-            f"{Fore.LIGHTRED_EX}Error: Node ID {node_id} not found in workflow.{Style.RESET_ALL}"
-        )
+        logger.error(f"Error: Node ID {node_id} not found in workflow.")
         return False
 
     node = workflow[node_id_str]
 
     if not isinstance(node, dict) or "inputs" not in node:
-        print(
-            f"{Fore.LIGHTRED_EX}Error: Node ID {node_id} doesn't have 'inputs' section.{Style.RESET_ALL}"
-        )
+        logger.error(f"Error: Node ID {node_id} doesn't have 'inputs' section.")
         return False
 
-    # Try to update with any recognized text input key
-    for key in TEXT_INPUT_KEYS:
-        if key in node["inputs"]:
-            node["inputs"][key] = text_value
-            print(
-                f"{Fore.LIGHTGREEN_EX}Updated node (ID: {node_id}) '{key}' with:{Style.RESET_ALL} {text_value}"
-            )
-            return True
+    # Update the highest-priority recognized text input key
+    matches = TEXT_INPUT_KEYS & node["inputs"].keys()
+    if matches:
+        key = next(k for k in TEXT_INPUT_PRIORITY if k in matches)
+        node["inputs"][key] = text_value
+        logger.info(f"Updated node (ID: {node_id}) '{key}' with: {text_value}")
+        return True
 
-    print(
-        f"{Fore.LIGHTRED_EX}Error: Node ID {node_id} doesn't have any recognized text input field.{Style.RESET_ALL}"
+    logger.error(
+        f"Error: Node ID {node_id} doesn't have any recognized text input field."
     )
     return False
 
@@ -353,87 +707,89 @@ def update_image_node_with_image(workflow, node_id, image_name):
     node_id_str = str(node_id)
 
     if node_id_str not in workflow:
-        print(
-            f"{Fore.LIGHTRED_EX}Error: Node ID {node_id} not found in workflow.{Style.RESET_ALL}"
-        )
+        logger.error(f"Error: Node ID {node_id} not found in workflow.")
         return False
 
     node = workflow[node_id_str]
 
     if not isinstance(node, dict) or node.get("class_type") != "LoadImage":
-        print(
-            f"{Fore.LIGHTRED_EX}Error: Node ID {node_id} is not a LoadImage node. Found class_type: {node.get('class_type', 'Unknown')}{Style.RESET_ALL}"
+        logger.error(
+            f"Error: Node ID {node_id} is not a LoadImage node. Found class_type: {node.get('class_type', 'Unknown')}"
         )
         return False
 
     node["inputs"]["image"] = image_name
-    print(
-        f"{Fore.LIGHTGREEN_EX}Updated LoadImage node (ID: {node_id}) with image: {image_name}{Style.RESET_ALL}"
-    )
+    logger.info(f"Updated LoadImage node (ID: {node_id}) with image: {image_name}")
     return True
 
 
-def cancel_workflow(prompt_id):
+async def cancel_workflow(prompt_id):
     """Cancel workflows using the global interrupt endpoint"""
     try:
-        url = f"http://{COMFY_SERVER}:{COMFY_PORT}/interrupt"
-        print(
-            f"{Fore.LIGHTBLACK_EX}Interrupting all workflows{Style.RESET_ALL} (including prompt ID: {prompt_id})"
-        )
-        response = requests.post(url, timeout=10)
+        url = URL_INTERRUPT
+        logger.info(f"Interrupting all workflows (including prompt ID: {prompt_id})")
+
+        # Fall back to a one-off session when called outside the server's loop
+        if HTTP_SESSION is None or HTTP_SESSION.closed:
+            async with create_http_session() as session:
+                return await _post_interrupt(session, url)
+        return await _post_interrupt(HTTP_SESSION, url)
+    except Exception as e:
+        logger.error(f"Error sending interrupt request: {e}")
+        return False
 
-        if response.status_code == 200:
-            print(
-                f"{Fore.LIGHTGREEN_EX}Interrupt request sent successfully.{Style.RESET_ALL}"
-            )
+
+async def _post_interrupt(session, url):
+    """POST to the ComfyUI interrupt endpoint"""
+    async with session.post(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+        if response.status == 200:
+            logger.info("Interrupt request sent successfully.")
             return True
         else:
-            print(
-                f"{Fore.LIGHTRED_EX}Failed to interrupt workflow: {response.status_code}{Style.RESET_ALL}"
-            )
+            logger.error(f"Failed to interrupt workflow: {response.status}")
             return False
-    except Exception as e:
-        print(
-            f"{Fore.LIGHTRED_EX}Error sending interrupt request:{Style.RESET_ALL} {e}"
-        )
-        return False
 
 
-def get_generated_image(prompt_id):
+async def get_generated_image(prompt_id):
     """Get generated image with robust retry and file verification"""
-    max_attempts = 12
+    max_attempts = 8  # About 21s of waiting in total
 
     for attempt in range(max_attempts):
         if attempt > 0:
-            wait_time = 1 + (attempt * 0.5)
-            print(
-                f"{Fore.LIGHTYELLOW_EX}Attempt {attempt + 1}/{max_attempts} - waiting {wait_time}s{Style.RESET_ALL}"
+            # Exponential backoff with jitter, capped at 8s per wait
+            wait_time = min(8.0, 0.1 * (2**attempt)) + random.uniform(0, 0.1)
+            logger.warning(
+                f"Attempt {attempt + 1}/{max_attempts} - waiting {wait_time:.2f}s"
             )
-            time.sleep(wait_time)
+            await asyncio.sleep(wait_time)
 
         try:
-            url = f"http://{COMFY_SERVER}:{COMFY_PORT}/history/{prompt_id}"
-            response = requests.get(url, timeout=10)
-
-            if response.status_code != 200:
-                print(
-                    f"{Fore.LIGHTYELLOW_EX}History API returned {response.status_code}, retrying...{Style.RESET_ALL}"
-                )
-                continue
+            url = URL_HISTORY_TMPL.format(prompt_id)
+            async with HTTP_SESSION.get(
+                url, timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                if response.status in (500, 502, 503):
+                    # Transient server-side error, worth retrying
+                    logger.warning(
+                        f"History API returned {response.status}, retrying..."
+                    )
+                    continue
+                if response.status == 404 and attempt < 3:
+                    logger.warning("History API returned 404, retrying...")
+                    continue
+                if response.status != 200:
+                    logger.error(f"History API returned {response.status}, giving up")
+                    return None, None
 
-            history_data = response.json()
+                history_data = orjson.loads(await response.read())
 
             if prompt_id not in history_data:
-                print(
-                    f"{Fore.LIGHTYELLOW_EX}Prompt ID {prompt_id} not in history yet, retrying...{Style.RESET_ALL}"
-                )
+                logger.warning(f"Prompt ID {prompt_id} not in history yet, retrying...")
                 continue
 
             outputs = history_data[prompt_id].get("outputs", {})
             if not outputs:
-                print(
-                    f"{Fore.LIGHTYELLOW_EX}No outputs in history yet, retrying...{Style.RESET_ALL}"
-                )
+                logger.warning("No outputs in history yet, retrying...")
                 continue
 
             # Extract image using existing logic
@@ -441,79 +797,56 @@ def get_generated_image(prompt_id):
 
             if filename and view_url:
                 # Verify file is actually accessible
-                if _verify_image_accessible(view_url):
-                    print(
-                        f"{Fore.LIGHTGREEN_EX}Image verified: {filename}{Style.RESET_ALL}"
-                    )
+                if await _verify_image_accessible(view_url):
+                    logger.info(f"Image verified: {filename}")
                     return filename, view_url
                 else:
-                    print(
-                        f"{Fore.LIGHTYELLOW_EX}Image metadata found but file not accessible yet...{Style.RESET_ALL}"
+                    logger.warning(
+                        "Image metadata found but file not accessible yet..."
                     )
             else:
-                print(
-                    f"{Fore.LIGHTYELLOW_EX}No output images found in attempt {attempt + 1}, retrying...{Style.RESET_ALL}"
+                logger.warning(
+                    f"No output images found in attempt {attempt + 1}, retrying..."
                 )
 
         except Exception as e:
-            print(
-                f"{Fore.LIGHTRED_EX}Error in attempt {attempt + 1}: {e}{Style.RESET_ALL}"
-            )
+            logger.error(f"Error in attempt {attempt + 1}: {e}")
 
-    print(
-        f"{Fore.LIGHTRED_EX}Failed to get accessible image after {max_attempts} attempts{Style.RESET_ALL}"
-    )
+    logger.error(f"Failed to get accessible image after {max_attempts} attempts")
     return None, None
 
 
-def _extract_image_from_outputs(outputs):
-    """Extract image info from outputs - extracted from original logic"""
-    # First, try the configured save image node
-    if SAVE_IMAGE_NODE_ID in outputs:
-        node_output = outputs[SAVE_IMAGE_NODE_ID]
-        if "images" in node_output:
-            for image in node_output["images"]:
-                if image["type"] == "output":
-                    filename = image["filename"]
-                    subfolder = image.get("subfolder", "")
-                    image_type = image["type"]
-
-                    # Construct the viewable URL
-                    view_url = (
-                        f"http://{COMFY_SERVER}:{COMFY_PORT}/view?filename={filename}"
-                    )
-                    if subfolder:
-                        view_url += f"&subfolder={subfolder}"
-                    view_url += f"&type={image_type}"
-
-                    return filename, view_url
+def _build_view_url(image):
+    """Build the (URL-encoded) ComfyUI view URL for an output image"""
+    params = (
+        ("filename", image["filename"]),
+        ("subfolder", image.get("subfolder", "")),
+        ("type", image["type"]),
+    )
+    return f"{VIEW_BASE}?{urlencode([(k, v) for k, v in params if v])}"
 
-    # Fallback: search all nodes for output images
-    for node_id, node_output in outputs.items():
-        if "images" in node_output:
-            for image in node_output["images"]:
-                if image["type"] == "output":
-                    filename = image["filename"]
-                    subfolder = image.get("subfolder", "")
-                    image_type = image["type"]
-
-                    view_url = (
-                        f"http://{COMFY_SERVER}:{COMFY_PORT}/view?filename={filename}"
-                    )
-                    if subfolder:
-                        view_url += f"&subfolder={subfolder}"
-                    view_url += f"&type={image_type}"
 
-                    return filename, view_url
+def _extract_image_from_outputs(outputs):
+    """Extract image info from outputs, preferring the configured save image node"""
+    # The configured save image node first, then every other node as a fallback
+    ordered_ids = ([SAVE_IMAGE_NODE_ID] if SAVE_IMAGE_NODE_ID in outputs else []) + [
+        node_id for node_id in outputs if node_id != SAVE_IMAGE_NODE_ID
+    ]
+    for node_id in ordered_ids:
+        for image in outputs[node_id].get("images", ()):
+            if image["type"] == "output":
+                return image["filename"], _build_view_url(image)
 
     return None, None
 
 
-def _verify_image_accessible(view_url):
+async def _verify_image_accessible(view_url):
     """Verify image is accessible via HEAD request"""
     try:
-        response = requests.head(view_url, timeout=5)
-        return response.status_code == 200
+        async with HTTP_SESSION.head(
+            view_url, timeout=aiohttp.ClientTimeout(total=5)
+        ) as response:
+            return response.status == 200
     except Exception:
         return False
 
@@ -523,122 +856,152 @@ async def handle_preview_image(binary_data):
     """Handle binary preview image data from ComfyUI WebSocket"""
     try:
         if len(binary_data) < 8:
-            print(
-                f"{Fore.LIGHTYELLOW_EX}Received short binary message: {len(binary_data)} bytes{Style.RESET_ALL}"
-            )
+            logger.warning(f"Received short binary message: {len(binary_data)} bytes")
             return
 
         # Extract event type from first 8 bytes (little-endian format)
-        event_type = struct.unpack("<Q", binary_data[:8])[0]
-        image_data = binary_data[8:]
+        event_type = _PREVIEW_HDR.unpack_from(binary_data)[0]
 
-        print(
-            f"{Fore.LIGHTCYAN_EX}Received preview image: {len(image_data)} bytes (event type: {event_type}){Style.RESET_ALL}"
+        logger.debug(
+            "Received preview image: %d bytes (event type: %d)",
+            len(binary_data) - _PREVIEW_HDR.size,
+            event_type,
         )
 
         # Broadcast the FULL binary data (including header) to Node-RED clients
         await broadcast_to_clients(binary_data, is_binary=True)
 
     except Exception as e:
-        print(f"{Fore.LIGHTRED_EX}Error handling preview image: {e}{Style.RESET_ALL}")
-        print(f"  Binary data length: {len(binary_data)} bytes")
+        logger.error(f"Error handling preview image: {e}")
+        logger.debug("  Binary data length: %d bytes", len(binary_data))
+
+
+def _invalidate_workflow_bytes():
+    """Drop the cached /prompt payload after workflow_json was modified"""
+    global _workflow_bytes, _workflow_version
+    _workflow_bytes = None
+    _workflow_version += 1
+
+
+def _serialize_prompt(workflow_data):
+    """Serialize the /prompt payload, reusing the cached bytes for workflow_json"""
+    global _workflow_bytes, _workflow_bytes_key
+
+    if workflow_data is not workflow_json:
+        return orjson.dumps({"prompt": workflow_data, "client_id": session_id})
+
+    # The payload embeds the client_id, which changes if the session ID does
+    key = (_workflow_version, session_id)
+    if _workflow_bytes is None or _workflow_bytes_key != key:
+        _workflow_bytes = orjson.dumps(
+            {"prompt": workflow_json, "client_id": session_id}
+        )
+        _workflow_bytes_key = key
+    return _workflow_bytes
 
 
 async def execute_workflow(workflow_data):
     """Execute the provided workflow - shared by both modes"""
-    global current_prompt_id, ws_connection, session_id, execution_status
+    global current_prompt_id, execution_status
 
     execution_status = "running"
 
-    # Connect to WebSocket first
-    ws_connection = None  # Reset the connection
-    ws = await connect_comfy_websocket(COMFY_SERVER, COMFY_PORT)
-    if not ws:
-        execution_status = "error"
-        return False
+    # Reuse the persistent WebSocket, only reconnecting if it dropped
+    if not comfy_websocket_is_open():
+        ws = await connect_comfy_websocket(COMFY_SERVER, COMFY_PORT)
+        if not ws:
+            execution_status = "error"
+            return False
 
     # Submit the workflow with the session ID as client_id
-    api_url = f"http://{COMFY_SERVER}:{COMFY_PORT}/prompt"
-    print(f"Submitting workflow to {api_url} with client_id: {session_id}")
+    api_url = URL_PROMPT
+    logger.info(f"Submitting workflow to {api_url} with client_id: {session_id}")
 
+    prompt_id = None
+    completed = False
     try:
-        response = requests.post(
-            api_url, json={"prompt": workflow_data, "client_id": session_id}, timeout=30
-        )
-
-        if response.status_code != 200:
-            print(f"Error submitting workflow: {response.status_code}")
-            print(response.text)
-            execution_status = "error"
-            return False
+        async with HTTP_SESSION.post(
+            api_url,
+            data=_serialize_prompt(workflow_data),
+            headers={"Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as response:
+            if response.status != 200:
+                logger.error(f"Error submitting workflow: {response.status}")
+                logger.error(await response.text())
+                execution_status = "error"
+                return False
+
+            result = orjson.loads(await response.read())
 
-        result = response.json()
         prompt_id = result.get("prompt_id")
         current_prompt_id = prompt_id
 
-        print(f"Workflow submitted successfully. Prompt ID: {prompt_id}")
+        logger.info(f"Workflow submitted successfully. Prompt ID: {prompt_id}")
+
+        # Resolved as soon as the save image node reports its output
+        pending_images[prompt_id] = asyncio.get_running_loop().create_future()
+        events = _register_prompt_queue(prompt_id)
 
         # Check for node errors
         if result.get("node_errors") and len(result.get("node_errors")) > 0:
-            print(f"Node errors detected: {result.get('node_errors')}")
+            logger.error(f"Node errors detected: {result.get('node_errors')}")
             execution_status = "error"
             return False
 
         # Subscribe to this prompt
         subscribe_msg = {"op": "subscribe_to_prompt", "data": {"prompt_id": prompt_id}}
-        await ws_connection.send(json.dumps(subscribe_msg))
-        print(f"Subscribed to prompt: {prompt_id}")
+        await ws_connection.send_str(orjson.dumps(subscribe_msg).decode())
+        logger.info(f"Subscribed to prompt: {prompt_id}")
 
         # Monitor for events
-        print("Waiting for execution events...")
+        logger.info("Waiting for execution events...")
         execution_complete = False
 
         try:
             while not execution_complete:
                 try:
-                    message = await asyncio.wait_for(ws_connection.recv(), timeout=180)
-
-                    # Check if message is binary (preview image data)
-                    if isinstance(message, bytes):
-                        await handle_preview_image(message)
-                        continue
+                    msg_data = await asyncio.wait_for(events.get(), timeout=180)
+                    if msg_data is None:
+                        logger.error(
+                            "WebSocket connection lost while waiting for events"
+                        )
+                        execution_status = "error"
+                        return False
 
-                    # Otherwise, parse as JSON
-                    msg_data = json.loads(message)
                     msg_type = msg_data.get("type")
 
-                    # Broadcast these text events to ws clients
-                    await broadcast_to_clients(message, is_binary=False)
-
                     if msg_type != "status":
-                        print(f"EVENT: {msg_type}")
+                        logger.debug("EVENT: %s", msg_type)
 
                         if msg_type == "progress":
-                            value = msg_data.get("data", {}).get("value", 0)
-                            max_val = msg_data.get("data", {}).get("max", 100)
-                            percent = int((value / max_val) * 100)
-                            print(f"  Progress: {value}/{max_val} ({percent}%)")
+                            if logger.isEnabledFor(logging.DEBUG):
+                                value = msg_data.get("data", {}).get("value", 0)
+                                max_val = msg_data.get("data", {}).get("max", 100)
+                                percent = int((value / max_val) * 100)
+                                logger.debug(
+                                    "  Progress: %s/%s (%d%%)", value, max_val, percent
+                                )
                         elif msg_type == "executing":
                             node = msg_data.get("data", {}).get("node")
-                            print(f"  Executing node: {node}")
-                            if str(node) == str(SAVE_IMAGE_NODE_ID):
-                                print(
-                                    f"{Fore.LIGHTGREEN_EX}Save image node ({SAVE_IMAGE_NODE_ID}) is executing...{Style.RESET_ALL}"
+                            logger.debug("  Executing node: %s", node)
+                            if node in SAVE_IMAGE_NODE_IDS:
+                                logger.info(
+                                    f"Save image node ({SAVE_IMAGE_NODE_ID}) is executing..."
                                 )
                         elif msg_type == "executed":
                             node = msg_data.get("data", {}).get("node")
-                            if str(node) == str(SAVE_IMAGE_NODE_ID):
-                                print(
-                                    f"{Fore.LIGHTGREEN_EX}Save image node ({SAVE_IMAGE_NODE_ID}) completed!{Style.RESET_ALL}"
+                            if node in SAVE_IMAGE_NODE_IDS:
+                                logger.info(
+                                    f"Save image node ({SAVE_IMAGE_NODE_ID}) completed!"
                                 )
-                                # Wait for file system sync after save node completes
-                                await asyncio.sleep(3)
+                                _resolve_pending_image(prompt_id, node, msg_data)
                         elif msg_type in ["execution_success", "execution_complete"]:
                             execution_complete = True
-                            print("Workflow execution completed successfully!")
+                            logger.info("Workflow execution completed successfully!")
                             break
                         elif msg_type == "execution_error":
-                            print(
+                            logger.error(
                                 f"Execution error: {msg_data.get('data', {}).get('exception_message', 'Unknown error')}"
                             )
                             execution_status = "error"
@@ -646,65 +1009,101 @@ async def execute_workflow(workflow_data):
                             break
 
                 except asyncio.TimeoutError:
-                    print(
-                        f"{Fore.LIGHTYELLOW_EX}WebSocket receiving timed out, but execution may still be running.{Style.RESET_ALL}"
+                    logger.warning(
+                        "WebSocket receiving timed out, but execution may still be running."
                     )
                     execution_status = "unknown"
                     break
-                except websockets.exceptions.ConnectionClosedError as e:
-                    print(
-                        f"{Fore.LIGHTRED_EX}WebSocket connection closed: {e}{Style.RESET_ALL}"
-                    )
-                    execution_status = "error"
-                    break
                 except Exception as e:
-                    print(
-                        f"{Fore.LIGHTRED_EX}Error receiving message: {e}{Style.RESET_ALL}"
-                    )
+                    logger.error(f"Error receiving message: {e}")
                     execution_status = "error"
                     break
 
-            await asyncio.sleep(2)  # Allow time for any final messages to be processed
-            print(
+            logger.info(
                 "All events processed. Check the output folder for your generated image."
             )
             execution_status = "completed"
+            completed = True
             return True
 
         except Exception as e:
-            print(f"{Fore.LIGHTRED_EX}Error monitoring events:{Style.RESET_ALL} {e}")
+            logger.error(f"Error monitoring events: {e}")
             execution_status = "error"
             if current_prompt_id:
-                cancel_workflow(current_prompt_id)
+                await cancel_workflow(current_prompt_id)
             return False
 
     except Exception as e:
-        print(f"{Fore.LIGHTRED_EX}Error submitting workflow:{Style.RESET_ALL} {e}")
+        logger.error(f"Error submitting workflow: {e}")
         execution_status = "error"
         return False
+    finally:
+        # Use our own prompt_id, an interrupt may have cleared current_prompt_id
+        prompt_queues.pop(prompt_id, None)
+        # The caller only claims the image future for a completed, still-current run
+        if not completed or current_prompt_id != prompt_id:
+            pending_images.pop(prompt_id, None)
+
+
+def _resolve_pending_image(prompt_id, node, msg_data):
+    """Resolve the prompt's pending image future from an "executed" event"""
+    future = pending_images.get(prompt_id)
+    if future is None or future.done():
+        return
+
+    output = msg_data.get("data", {}).get("output") or {}
+    filename, view_url = _extract_image_from_outputs({str(node): output})
+    if filename and view_url:
+        future.set_result((filename, view_url))
+
+
+async def _wait_for_generated_image(prompt_id, image_future):
+    """Get the image from the WS event, falling back to polling the history API"""
+    # "executed" always precedes "execution_success", so a pending future stays pending
+    if image_future is not None and image_future.done():
+        image_filename, image_url = image_future.result()
+        if await _verify_image_accessible(image_url):
+            logger.info(f"Image verified: {image_filename}")
+            return image_filename, image_url
+        logger.warning(
+            "Image reported by WebSocket not accessible yet, checking history..."
+        )
+    else:
+        logger.warning("No image event received, checking history...")
+
+    return await get_generated_image(prompt_id)
 
 
 # HTTP Request Handlers
 async def handle_health_check(request):
     """Simple health check endpoint"""
-    response_data = {"STATUS": "ComfyUI Workflow Runner is running"}
-    return create_json_response(response_data)
+    return create_static_json_response(_BODY_HEALTH)
 
 
 async def handle_status(request):
     """Get current execution status and system information"""
-    global execution_status, current_prompt_id, workflow_json, connected_clients
-
-    status_data = {
-        "STATUS": "Server running",
-        "execution_status": execution_status,
-        "current_prompt_id": current_prompt_id,
-        "workflow_loaded": workflow_json is not None,
-        "connected_ws_clients": len(connected_clients),
-        "comfy_server": f"{COMFY_SERVER}:{COMFY_PORT}",
-        "save_image_node_id": SAVE_IMAGE_NODE_ID,
-    }
-    return create_json_response(status_data)
+    global _status_bytes, _status_bytes_key
+
+    key = (
+        execution_status,
+        current_prompt_id,
+        workflow_json is not None,
+        len(connected_clients),
+    )
+    if _status_bytes is None or _status_bytes_key != key:
+        _status_bytes = orjson.dumps(
+            {
+                "STATUS": "Server running",
+                "execution_status": execution_status,
+                "current_prompt_id": current_prompt_id,
+                "workflow_loaded": workflow_json is not None,
+                "connected_ws_clients": len(connected_clients),
+                "comfy_server": f"{COMFY_SERVER}:{COMFY_PORT}",
+                "save_image_node_id": SAVE_IMAGE_NODE_ID,
+            }
+        )
+        _status_bytes_key = key
+    return create_static_json_response(_status_bytes)
 
 
 async def _execute_workflow_and_get_result():
@@ -712,21 +1111,20 @@ async def _execute_workflow_and_get_result():
     global current_prompt_id
 
     success = await execute_workflow(workflow_json)
+    image_future = pending_images.pop(current_prompt_id, None)
 
     if success and execution_status == "completed":
-        print(
-            f"{Fore.LIGHTYELLOW_EX}Workflow completed, getting image info...{Style.RESET_ALL}"
-        )
+        logger.info("Workflow completed, getting image info...")
 
-        image_filename, image_url = get_generated_image(current_prompt_id)
+        image_filename, image_url = await _wait_for_generated_image(
+            current_prompt_id, image_future
+        )
         prompt_id_used = current_prompt_id
         current_prompt_id = None
 
         if image_filename and image_url:
-            print(
-                f"{Fore.LIGHTGREEN_EX}Generated image: {image_filename}{Style.RESET_ALL}"
-            )
-            print(f"{Fore.LIGHTCYAN_EX}View at: {image_url}{Style.RESET_ALL}")
+            logger.info(f"Generated image: {image_filename}")
+            logger.info(f"View at: {image_url}")
 
             # Also publish to WS
             ws_message = {
@@ -737,7 +1135,11 @@ async def _execute_workflow_and_get_result():
                 "prompt_id": prompt_id_used,
             }
             # Broadcast these text events to ws clients
-            await broadcast_to_clients(json.dumps(ws_message), is_binary=False)
+            await broadcast_to_clients(
+                orjson.dumps(ws_message),
+                is_binary=False,
+                event_type=ws_message["type"],
+            )
 
             return {
                 "STATUS": "completed successfully",
@@ -746,9 +1148,7 @@ async def _execute_workflow_and_get_result():
                 "prompt_id": prompt_id_used,
             }, 200
         else:
-            print(
-                f"{Fore.LIGHTYELLOW_EX}Workflow completed but no image found{Style.RESET_ALL}"
-            )
+            logger.warning("Workflow completed but no image found")
             return {
                 "STATUS": "completed but no image found",
                 "prompt_id": prompt_id_used,
@@ -757,9 +1157,7 @@ async def _execute_workflow_and_get_result():
         error_status = (
             execution_status if execution_status != "completed" else "unknown_error"
         )
-        print(
-            f"{Fore.LIGHTRED_EX}Workflow execution failed: {error_status}{Style.RESET_ALL}"
-        )
+        logger.error(f"Workflow execution failed: {error_status}")
         return {
             "STATUS": f"generation failed - {error_status}",
             "execution_status": execution_status,
@@ -781,7 +1179,7 @@ async def handle_queue(request):
     if error_response:
         return create_json_response(error_response, status_code)
 
-    print(f"{Fore.LIGHTCYAN_EX}Received request to execute workflow{Style.RESET_ALL}")
+    logger.info("Received request to execute workflow")
 
     # OLD
     # result_data, status_code = await _execute_workflow_and_get_result()
@@ -798,8 +1196,8 @@ async def handle_queue(request):
             "current_prompt_id": current_prompt_id
         }, 408)
     except Exception as e:
-        print(f"{Fore.LIGHTRED_EX}Error executing workflow: {str(e)}{Style.RESET_ALL}")
-        return create_json_response({"STATUS": f"Error: {str(e)}"}, 500)
+        logger.error(f"Error executing workflow: {e}")
+        return create_json_response({"STATUS": f"Error: {e}"}, 500)
     
     return create_json_response(result_data, status_code)
 
@@ -809,12 +1207,10 @@ async def handle_update_text(request):
     global workflow_json, execution_status
 
     if execution_status == "running":
-        return create_json_response(
-            {"STATUS": "Cannot update text while workflow is running"}, 400
-        )
+        return create_static_json_response(_BODY_TEXT_RUNNING, 400)
 
     if not workflow_json:
-        return create_json_response({"STATUS": "No workflow loaded"}, 400)
+        return create_static_json_response(_BODY_NO_WORKFLOW, 400)
 
     try:
         # Validate JSON request
@@ -831,8 +1227,9 @@ async def handle_update_text(request):
         success = update_text_node_with_text(workflow_json, node_id, data.get("text"))
 
         if success:
-            return create_json_response(
-                {"STATUS": f"Updated text in node {node_id} successfully"}
+            _invalidate_workflow_bytes()
+            return _ok_status_bytes(
+                b'{"STATUS":"Updated text in node %d successfully"}', node_id
             )
         else:
             return create_json_response(
@@ -840,8 +1237,8 @@ async def handle_update_text(request):
             )
 
     except Exception as e:
-        print(f"{Fore.LIGHTRED_EX}Error updating text: {str(e)}{Style.RESET_ALL}")
-        return create_json_response({"STATUS": f"Error updating text: {str(e)}"}, 500)
+        logger.error(f"Error updating text: {e}")
+        return create_json_response({"STATUS": f"Error updating text: {e}"}, 500)
 
 
 async def handle_update_image(request):
@@ -849,12 +1246,10 @@ async def handle_update_image(request):
     global workflow_json, execution_status
 
     if execution_status == "running":
-        return create_json_response(
-            {"STATUS": "Cannot update image while workflow is running"}, 400
-        )
+        return create_static_json_response(_BODY_IMAGE_RUNNING, 400)
 
     if not workflow_json:
-        return create_json_response({"STATUS": "No workflow loaded"}, 400)
+        return create_static_json_response(_BODY_NO_WORKFLOW, 400)
 
     try:
         # Validate JSON request
@@ -873,10 +1268,11 @@ async def handle_update_image(request):
         )
 
         if success:
-            return create_json_response(
-                {
-                    "STATUS": f"Updated image in node {node_id} to {data.get('filename')} successfully"
-                }
+            _invalidate_workflow_bytes()
+            return _ok_status_bytes(
+                b'{"STATUS":"Updated image in node %d to %s successfully"}',
+                node_id,
+                _json_escape(data.get("filename")),
             )
         else:
             return create_json_response(
@@ -884,8 +1280,8 @@ async def handle_update_image(request):
             )
 
     except Exception as e:
-        print(f"{Fore.LIGHTRED_EX}Error updating image: {str(e)}{Style.RESET_ALL}")
-        return create_json_response({"STATUS": f"Error updating image: {str(e)}"}, 500)
+        logger.error(f"Error updating image: {e}")
+        return create_json_response({"STATUS": f"Error updating image: {e}"}, 500)
 
 
 async def handle_interrupt(request):
@@ -900,8 +1296,8 @@ async def handle_interrupt(request):
         return create_json_response(response_data)
 
     except Exception as e:
-        print(f"{Fore.LIGHTRED_EX}Error in handle_interrupt: {str(e)}{Style.RESET_ALL}")
-        return create_json_response({"STATUS": f"Error: {str(e)}"}, 500)
+        logger.error(f"Error in handle_interrupt: {e}")
+        return create_json_response({"STATUS": f"Error: {e}"}, 500)
 
 
 async def do_interrupt():
@@ -909,68 +1305,70 @@ async def do_interrupt():
     global current_prompt_id, execution_status
 
     try:
-        # First, interrupt the current execution
-        interrupt_url = f"http://{COMFY_SERVER}:{COMFY_PORT}/interrupt"
-        print(f"{Fore.LIGHTYELLOW_EX}Interrupting workflow execution{Style.RESET_ALL}")
-
-        async with aiohttp.ClientSession() as session:
-            # Send interrupt
-            async with session.post(interrupt_url) as interrupt_response:
-                if interrupt_response.status != 200:
-                    print(
-                        f"{Fore.LIGHTRED_EX}Failed to interrupt: {interrupt_response.status}{Style.RESET_ALL}"
+        interrupt_url = URL_INTERRUPT
+        queue_url = URL_QUEUE
+        logger.info("Interrupting workflow execution")
+
+        # Send the interrupt and fetch the current queue concurrently
+        responses = await asyncio.gather(
+            HTTP_SESSION.post(interrupt_url),
+            HTTP_SESSION.get(queue_url),
+            return_exceptions=True,
+        )
+        try:
+            interrupt_response, queue_response = responses
+            if isinstance(interrupt_response, BaseException):
+                raise interrupt_response
+            if interrupt_response.status != 200:
+                logger.error(f"Failed to interrupt: {interrupt_response.status}")
+                return
+
+            if isinstance(queue_response, BaseException):
+                raise queue_response
+            if queue_response.status == 200:
+                queue_data = orjson.loads(await queue_response.read())
+
+                # Collect all prompt IDs to delete
+                # (queue items are arrays with prompt_id at index 1)
+                all_prompt_ids = [
+                    item[1]
+                    for item in chain(
+                        queue_data.get("queue_running", ()),
+                        queue_data.get("queue_pending", ()),
                     )
-                    return
-
-            # Get current queue
-            queue_url = f"http://{COMFY_SERVER}:{COMFY_PORT}/queue"
-            async with session.get(queue_url) as queue_response:
-                if queue_response.status == 200:
-                    queue_data = await queue_response.json()
-
-                    # Collect all prompt IDs to delete
-                    queue_running = queue_data.get("queue_running", [])
-                    queue_pending = queue_data.get("queue_pending", [])
-
-                    all_prompt_ids = []
-                    for item in queue_running + queue_pending:
-                        if (
-                            len(item) > 1
-                        ):  # Queue items are arrays with prompt_id at index 1
-                            all_prompt_ids.append(item[1])
-
-                    if all_prompt_ids:
-                        # Delete all queued items
-                        delete_data = {"delete": all_prompt_ids}
-                        async with session.post(
-                            queue_url, json=delete_data
-                        ) as delete_response:
-                            if delete_response.status == 200:
-                                print(
-                                    f"{Fore.LIGHTGREEN_EX}Successfully cleared {len(all_prompt_ids)} items from queue{Style.RESET_ALL}"
-                                )
-                            else:
-                                print(
-                                    f"{Fore.LIGHTRED_EX}Failed to clear queue: {delete_response.status}{Style.RESET_ALL}"
-                                )
-                    else:
-                        print(
-                            f"{Fore.LIGHTYELLOW_EX}No items in queue to clear{Style.RESET_ALL}"
-                        )
+                    if len(item) > 1
+                ]
+
+                if all_prompt_ids:
+                    # Delete all queued items (depends on the queue snapshot above)
+                    delete_data = {"delete": all_prompt_ids}
+                    async with HTTP_SESSION.post(
+                        queue_url, json=delete_data
+                    ) as delete_response:
+                        if delete_response.status == 200:
+                            logger.info(
+                                f"Successfully cleared {len(all_prompt_ids)} items from queue"
+                            )
+                        else:
+                            logger.error(
+                                f"Failed to clear queue: {delete_response.status}"
+                            )
                 else:
-                    print(
-                        f"{Fore.LIGHTRED_EX}Failed to get queue status: {queue_response.status}{Style.RESET_ALL}"
-                    )
+                    logger.warning("No items in queue to clear")
+            else:
+                logger.error(f"Failed to get queue status: {queue_response.status}")
+        finally:
+            for response in responses:
+                if isinstance(response, aiohttp.ClientResponse):
+                    response.release()
 
         # Reset status
         execution_status = "idle"
         current_prompt_id = None
-        print(f"{Fore.LIGHTGREEN_EX}Interrupt completed successfully{Style.RESET_ALL}")
+        logger.info("Interrupt completed successfully")
 
     except Exception as e:
-        print(
-            f"{Fore.LIGHTRED_EX}Error during interrupt operation: {str(e)}{Style.RESET_ALL}"
-        )
+        logger.error(f"Error during interrupt operation: {e}")
         execution_status = "error"
 
 
@@ -988,33 +1386,60 @@ async def start_minimal_http_server():
     app.router.add_post("/interrupt", handle_interrupt)
 
     # Start the server
-    runner = web.AppRunner(app)
+    runner = web.AppRunner(app, access_log=None, handle_signals=False)
     await runner.setup()
     site = web.TCPSite(runner, COMFY_SERVER, MIDDLEWARE_HTTP_PORT)
 
-    print(
-        f"{Fore.LIGHTYELLOW_EX}Starting HTTP server on:{Fore.LIGHTBLACK_EX} http://{COMFY_SERVER}:{MIDDLEWARE_HTTP_PORT} {Style.RESET_ALL}"
+    logger.info(
+        f"Starting HTTP server on: http://{COMFY_SERVER}:{MIDDLEWARE_HTTP_PORT}"
     )
     await site.start()
 
+    # Optional extra UNIX socket for same-host clients, skipping the TCP stack
+    if MIDDLEWARE_UNIX_SOCKET:
+        if not hasattr(socket, "AF_UNIX"):
+            logger.warning(
+                f"UNIX sockets not supported here, not serving on: "
+                f"unix:{MIDDLEWARE_UNIX_SOCKET}"
+            )
+        else:
+            unix_site = web.UnixSite(runner, MIDDLEWARE_UNIX_SOCKET)
+            logger.info(f"Starting HTTP server on: unix:{MIDDLEWARE_UNIX_SOCKET}")
+            await unix_site.start()
+
     return runner
 
 
 async def run_continuous_mode():
     """Simplified: Load workflow → Start server → Wait for API calls"""
-    global COMFY_SERVER, COMFY_PORT, workflow_json, ws_connection
+    global HTTP_SESSION
 
-    print(
-        f"\n{Fore.LIGHTCYAN_EX}Starting ComfyUI workflow executor in {Fore.LIGHTYELLOW_EX}CONTINUOUS{Fore.LIGHTCYAN_EX} mode.{Style.RESET_ALL}"
-    )
+    logger.info("\nStarting ComfyUI workflow executor in CONTINUOUS mode.")
+
+    # One pooled keep-alive session for all ComfyUI HTTP traffic
+    HTTP_SESSION = create_http_session()
+    try:
+        return await _serve_continuous()
+    finally:
+        await HTTP_SESSION.close()
+        HTTP_SESSION = None
+
+
+async def _serve_continuous():
+    """Connect to ComfyUI, start the servers and keep them running"""
+    global workflow_json
 
     # Test connectivity to ComfyUI first
-    if not test_comfyui_connection(COMFY_SERVER, COMFY_PORT):
-        print(
-            f"{Fore.LIGHTRED_EX}Failed to connect to ComfyUI server. Please make sure it's running.{Style.RESET_ALL}"
+    if not await test_comfyui_connection():
+        logger.error(
+            "Failed to connect to ComfyUI server. Please make sure it's running."
         )
         return False
 
+    # Open the persistent ComfyUI WebSocket once; it's reused by every workflow run
+    if not await connect_comfy_websocket(COMFY_SERVER, COMFY_PORT):
+        ws_down.set()
+
     # Load the workflow into memory
     workflow_json = load_workflow_from_file(CURR_WORKFLOW)
     if not workflow_json:
@@ -1022,21 +1447,21 @@ async def run_continuous_mode():
 
     # Start HTTP server
     http_runner = await start_minimal_http_server()
-    print(
-        f"{Fore.LIGHTGREEN_EX}Server is now listening on:{Fore.LIGHTBLACK_EX} http://{COMFY_SERVER}:{MIDDLEWARE_HTTP_PORT} {Style.RESET_ALL}"
+    logger.info(
+        f"Server is now listening on: http://{COMFY_SERVER}:{MIDDLEWARE_HTTP_PORT}"
     )
 
     # Start WebSocket server for Node-RED clients
-    await start_websocket_server()
+    ws_runner = await start_websocket_server()
 
-    print(
+    logger.info(
         f"""
-    {Fore.LIGHTCYAN_EX}All servers ready!{Style.RESET_ALL}
+    All servers ready!
 
-    {Fore.LIGHTMAGENTA_EX}- HTTP API:{Style.RESET_ALL} http://{COMFY_SERVER}:{MIDDLEWARE_HTTP_PORT}
-    {Fore.LIGHTMAGENTA_EX}- WebSocket Stream:{Style.RESET_ALL} ws://{COMFY_SERVER}:{RELAY_WS_PORT} (relay ComfyUI events to clients)
+    - HTTP API: http://{COMFY_SERVER}:{MIDDLEWARE_HTTP_PORT}
+    - WebSocket Stream: ws://{COMFY_SERVER}:{RELAY_WS_PORT} (relay ComfyUI events to clients)
 
-    {Fore.LIGHTCYAN_EX}Available HTTP REST API endpoints:{Style.RESET_ALL}
+    Available HTTP REST API endpoints:
     - GET  /health         - Health check
     - GET  /status         - System status and information
     - POST /update/text    {{"node_id": 59, "text": "..."}}        - Update text in specific node
@@ -1044,29 +1469,22 @@ async def run_continuous_mode():
     - GET  /queue          - Execute workflow
     - POST /interrupt      - Stop running workflow
 
-    {Fore.LIGHTYELLOW_EX}Workflow loaded and ready for API calls!{Style.RESET_ALL}
-    {Fore.LIGHTYELLOW_EX}Ready to relay ComfyUI events to clients (e.g.: Node-RED){Style.RESET_ALL}
+    Workflow loaded and ready for API calls!
+    Ready to relay ComfyUI events to clients (e.g.: Node-RED)
     """
     )
 
     try:
-        # Keep the server running and maintain WebSocket connection
-        while True:
-            try:
-                # Periodic WebSocket health check
-                if ws_connection is None or ws_connection.closed:
-                    print(
-                        f"{Fore.YELLOW}WebSocket connection needs refresh. Reconnecting...{Style.RESET_ALL}"
-                    )
-                    await connect_comfy_websocket(COMFY_SERVER, COMFY_PORT)
-            except Exception:
-                pass  # Ignore connection check errors
-            await asyncio.sleep(30)
+        # Keep the server running; cancelling the group stops every background task
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_ws_reconnect_watcher())
 
     except asyncio.CancelledError:
-        print("Server shutdown requested")
+        logger.info("Server shutdown requested")
     finally:
-        print("Cleaning up resources...")
+        logger.info("Cleaning up resources...")
+        await close_comfy_websocket()
+        await ws_runner.cleanup()
         await http_runner.cleanup()
 
     return True
@@ -1074,18 +1492,16 @@ async def run_continuous_mode():
 
 def main():
     """Main entry point"""
-    print(
-        f"{Fore.LIGHTCYAN_EX}ComfyUI Workflow Runner{Style.RESET_ALL} (Press Ctrl+C to cancel at any time)"
-    )
+    logger.info("ComfyUI Workflow Runner (Press Ctrl+C to cancel at any time)")
 
     try:
         asyncio.run(run_continuous_mode())
     except KeyboardInterrupt:
-        print("\nKeyboard interrupt detected.")
+        logger.info("\nKeyboard interrupt detected.")
         if current_prompt_id:
-            cancel_workflow(current_prompt_id)
+            asyncio.run(cancel_workflow(current_prompt_id))
     finally:
-        print("Script execution complete.")
+        logger.info("Script execution complete.")
 
 
 if __name__ == "__main__":
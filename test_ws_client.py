@@ -1,23 +1,32 @@
 # Save as test_client.py
 import asyncio
 import websockets
-import json
+import orjson
+
+# ComfyUI writes JSON with spaces, compact encoders don't; both fit in the first bytes
+PROGRESS_MARKERS = ('"type": "progress"', '"type":"progress"')
 
 
 async def test_client():
     uri = "ws://192.168.5.223:8190"  # **Update it to the IP ofg Comfy Server and the machine where the mian python relay is running from
-    async with websockets.connect(uri) as websocket:
+    # Image frames are already compressed and can be large: no deflate, no size cap
+    async with websockets.connect(
+        uri, compression=None, max_size=None, ping_interval=20
+    ) as websocket:
         print("Connected! Waiting for messages...")
 
         while True:
             try:
                 message = await websocket.recv()
 
-                if isinstance(message, bytes):
+                if isinstance(message, (bytes, bytearray)):
                     print(f"Received BINARY image: {len(message)} bytes")
+                elif any(marker in message[:32] for marker in PROGRESS_MARKERS):
+                    # Most frequent event, no need to parse it just to print its type
+                    print("Event: progress")
                 else:
                     # Text message (JSON)
-                    data = json.loads(message)
+                    data = orjson.loads(message)
                     print(f"Event: {data.get('type', 'unknown')}")
 
             except Exception as e: